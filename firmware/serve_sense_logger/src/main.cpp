@@ -24,7 +24,7 @@ static const float GYR_LSB_PER_DPS = 131.0f;
 // ---------- BLE UUIDs ----------
 static const NimBLEUUID SVC_UUID ((uint16_t)0xFF00);
 static const NimBLEUUID IMU_UUID ((uint16_t)0xFF01);  // notify
-static const NimBLEUUID CTRL_UUID((uint16_t)0xFF02);  // write
+static const NimBLEUUID CTRL_UUID((uint16_t)0xFF02);  // write / write-no-response
 
 // ---------- Globals ----------
 NimBLECharacteristic* imuChar = nullptr;
@@ -190,7 +190,7 @@ void setup() {
       IMU_UUID, NIMBLE_PROPERTY::NOTIFY
   );
   auto ctrl = svc->createCharacteristic(
-      CTRL_UUID, NIMBLE_PROPERTY::WRITE
+      CTRL_UUID, NIMBLE_PROPERTY::WRITE | NIMBLE_PROPERTY::WRITE_NR
   );
   ctrl->setCallbacks(new CbCtrl());
   svc->start();
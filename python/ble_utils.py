@@ -4,14 +4,15 @@ BLE utility module with Windows-compatible operations.
 This module provides Windows-safe BLE operations including:
 - Proper Windows COM threading initialization
 - Event loop policy configuration for Windows
-- Device discovery with retry mechanisms
+- Device discovery from one scan that stops on the first match
 - Robust error handling and logging
 
 Usage:
-    from ble_utils import setup_windows_event_loop, discover_device_with_retry
+    from ble_utils import setup_windows_event_loop, setup_fast_event_loop, discover_device_with_retry
     
-    # Initialize Windows-compatible event loop
+    # Initialize Windows-compatible event loop (uvloop elsewhere, if installed)
     setup_windows_event_loop()
+    setup_fast_event_loop()
     
     # Discover device with retry
     address = await discover_device_with_retry("ServeSense")
@@ -19,14 +20,21 @@ Usage:
 
 import asyncio
 import logging
+import random
 import sys
-from typing import Optional, List, Tuple
+from typing import Callable, Dict, Optional, List, Tuple
 
 from bleak import BleakScanner, BleakClient
+from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Upper bounds for retry waits and per-attempt scan windows (seconds)
+MAX_BACKOFF_DELAY = 5.0
+MAX_SCAN_WINDOW = 10.0
+
 
 def setup_windows_event_loop():
     """
@@ -43,6 +51,31 @@ def setup_windows_event_loop():
         logger.info("Windows event loop policy configured (ProactorEventLoop)")
 
 
+def setup_fast_event_loop() -> bool:
+    """
+    Use uvloop for asyncio on Linux/macOS when it is installed.
+    
+    uvloop dispatches notify callbacks from C instead of the pure-Python
+    selector loop. Windows keeps the ProactorEventLoop configured by
+    setup_windows_event_loop(), which bleak's WinRT backend is tested with.
+    Must be called before asyncio.run().
+    
+    Returns True if uvloop was installed, False otherwise.
+    """
+    if sys.platform == "win32":
+        return False
+    
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not installed - using the default asyncio event loop")
+        return False
+    
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("uvloop event loop policy configured")
+    return True
+
+
 def init_windows_com_threading():
     """
     Initialize Windows COM threading for BLE operations.
@@ -63,6 +96,77 @@ def init_windows_com_threading():
     return True
 
 
+class BLEConnectionError(RuntimeError):
+    """Raised when BLEConnectionManager cannot connect after all retries."""
+
+
+def _backoff_delay(attempt: int, backoff_factor: float = 2.0) -> float:
+    """
+    Jittered exponential backoff, capped at MAX_BACKOFF_DELAY.
+    
+    The jitter keeps several clients from retrying in lockstep; the cap
+    keeps late retries from idling for longer than a connect takes.
+    """
+    return min(backoff_factor ** attempt, MAX_BACKOFF_DELAY) + random.uniform(0, 0.5)
+
+
+async def _scan(
+    timeout: float,
+    match: Optional[Callable[[BLEDevice], bool]] = None,
+    start_attempts: int = 1,
+    backoff_factor: float = 2.0
+) -> Dict[str, BLEDevice]:
+    """
+    Run one scan, collecting advertisements as they arrive.
+    
+    Shared helper behind scan_devices() and discover_device_with_retry().
+    Each call opens its own BleakScanner for the whole window instead of
+    restarting it per retry, and stops early once `match` accepts a device.
+    
+    Args:
+        timeout: Maximum scan window in seconds
+        match: Optional predicate; the scan stops as soon as a device matches
+        start_attempts: Tries at starting the scanner, with jittered backoff
+            between them; errors once the scan is running are not retried
+        backoff_factor: Backoff multiplier between start attempts
+        
+    Returns:
+        Dict of address -> BLEDevice for every device seen, in detection order
+    """
+    seen: Dict[str, BLEDevice] = {}
+    done = asyncio.Event()
+    
+    def on_detection(device: BLEDevice, _adv: AdvertisementData):
+        seen[device.address] = device
+        if match is not None and match(device):
+            done.set()
+    
+    for attempt in range(start_attempts):
+        scanner = BleakScanner(detection_callback=on_detection)
+        try:
+            await scanner.start()
+            break
+        except Exception as e:
+            # Starting can fail transiently, e.g. right after the adapter
+            # wakes on Windows
+            if attempt >= start_attempts - 1:
+                raise
+            wait_time = _backoff_delay(attempt, backoff_factor)
+            logger.warning(
+                f"[BLE] Scanner failed to start ({e}); retrying in {wait_time:.1f}s..."
+            )
+            await asyncio.sleep(wait_time)
+    
+    try:
+        await asyncio.wait_for(done.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        await scanner.stop()
+    
+    return seen
+
+
 async def discover_device_with_retry(
     name_hint: str,
     timeout: float = 5.0,
@@ -70,57 +174,63 @@ async def discover_device_with_retry(
     backoff_factor: float = 2.0
 ) -> str:
     """
-    Discover BLE device with exponential backoff retry.
+    Discover BLE device using one scan that stops on the first match.
+    
+    The scan returns as soon as the first matching advertisement arrives.
+    The scan window covers the same total time the old retry schedule did
+    (timeout, timeout * backoff_factor, ... for max_retries attempts, each
+    capped at MAX_SCAN_WINDOW), without restarting the scanner. If the
+    scanner fails to start (e.g. the adapter is not ready yet), starting
+    it is retried up to max_retries times with jittered exponential
+    backoff; the scan window only begins once the scanner is running.
     
     Args:
         name_hint: Device name substring to search for
-        timeout: Timeout for each discovery attempt (seconds)
-        max_retries: Maximum number of retry attempts
-        backoff_factor: Multiplier for exponential backoff
+        timeout: Scan window of the first attempt (seconds)
+        max_retries: Number of attempts the scan window covers, and number
+            of tries at starting the scanner
+        backoff_factor: Multiplier applied to the window of each attempt
+            and to the backoff between scanner start attempts
         
     Returns:
         Device address (MAC address)
         
     Raises:
-        RuntimeError: If device not found after all retries
+        RuntimeError: If device not found within the scan window, or the
+            scan failed
     """
-    attempt = 0
-    current_timeout = timeout
+    needle = name_hint.lower()
     
-    while attempt < max_retries:
-        try:
-            logger.info(
-                f"[BLE] Scanning for '{name_hint}' (attempt {attempt + 1}/{max_retries}, "
-                f"timeout={current_timeout:.1f}s)..."
-            )
-            
-            devices = await BleakScanner.discover(timeout=current_timeout)
-            
-            for dev in devices:
-                if dev.name and name_hint.lower() in dev.name.lower():
-                    logger.info(f"[BLE] Found {dev.name} @ {dev.address}")
-                    return dev.address
-            
-            # Device not found in this scan
-            logger.warning(
-                f"[BLE] Device '{name_hint}' not found in scan "
-                f"(found {len(devices)} devices total)"
-            )
-            
-        except Exception as e:
-            logger.error(f"[BLE] Scan error on attempt {attempt + 1}: {e}")
-        
-        # Prepare for retry
-        attempt += 1
-        if attempt < max_retries:
-            wait_time = backoff_factor ** attempt
-            logger.info(f"[BLE] Retrying in {wait_time:.1f} seconds...")
-            await asyncio.sleep(wait_time)
-            # Increase timeout for next attempt
-            current_timeout *= backoff_factor
+    def matches(device: BLEDevice) -> bool:
+        return bool(device.name) and needle in device.name.lower()
     
+    total_timeout = sum(
+        min(timeout * backoff_factor ** i, MAX_SCAN_WINDOW) for i in range(max_retries)
+    )
+    logger.info(
+        f"[BLE] Scanning for '{name_hint}' (timeout={total_timeout:.1f}s)..."
+    )
+    
+    try:
+        devices = await _scan(
+            total_timeout, matches,
+            start_attempts=max(1, max_retries), backoff_factor=backoff_factor
+        )
+    except Exception as e:
+        logger.error(f"[BLE] Scan error: {e}")
+        raise RuntimeError(f"BLE scan for '{name_hint}' failed: {e}") from e
+    
+    for dev in devices.values():
+        if matches(dev):
+            logger.info(f"[BLE] Found {dev.name} @ {dev.address}")
+            return dev.address
+    
+    logger.warning(
+        f"[BLE] Device '{name_hint}' not found in scan "
+        f"(found {len(devices)} devices total)"
+    )
     raise RuntimeError(
-        f"No BLE device found matching '{name_hint}' after {max_retries} attempts"
+        f"No BLE device found matching '{name_hint}' after {total_timeout:.1f}s"
     )
 
 
@@ -136,10 +246,10 @@ async def scan_devices(timeout: float = 5.0) -> List[Tuple[str, str]]:
     """
     try:
         logger.info(f"[BLE] Scanning for devices (timeout={timeout}s)...")
-        devices = await BleakScanner.discover(timeout=timeout)
+        devices = await _scan(timeout)
         
         result = []
-        for dev in devices:
+        for dev in devices.values():
             name = dev.name if dev.name else "(unnamed device)"
             result.append((dev.address, name))
         
@@ -151,6 +261,45 @@ async def scan_devices(timeout: float = 5.0) -> List[Tuple[str, str]]:
         raise
 
 
+def request_low_latency_connection(client: BleakClient):
+    """
+    Ask the OS for a short BLE connection interval on an open connection.
+    
+    bleak has no public API for connection parameters, so this is a
+    best-effort call into the platform backend:
+    - Windows 11+: requests ThroughputOptimized preferred parameters
+      (7.5-11.25 ms interval) on the underlying BluetoothLEDevice
+    - Linux (BlueZ) and macOS: no user-space API exists; logs and returns
+    
+    Args:
+        client: A connected BleakClient
+        
+    Returns:
+        The platform request handle (must be kept alive for the request to
+        stay in effect), or None if the request was not made
+    """
+    if sys.platform != "win32":
+        logger.info("[BLE] Connection interval is managed by the OS on this platform")
+        return None
+    
+    try:
+        if sys.version_info >= (3, 12):
+            from winrt.windows.devices.bluetooth import BluetoothLEPreferredConnectionParameters
+        else:
+            from bleak_winrt.windows.devices.bluetooth import BluetoothLEPreferredConnectionParameters
+        
+        device = client._backend._requester
+        request = device.request_preferred_connection_parameters(
+            BluetoothLEPreferredConnectionParameters.throughput_optimized
+        )
+        logger.info("[BLE] Requested throughput-optimized connection parameters")
+        return request
+    except Exception as e:
+        # Older Windows builds and WinRT projections lack this API
+        logger.warning(f"[BLE] Could not request connection parameters: {e}")
+        return None
+
+
 class BLEConnectionManager:
     """
     Manages BLE connections with Windows-compatible error handling.
@@ -158,7 +307,7 @@ class BLEConnectionManager:
     This class provides a robust wrapper around BleakClient with:
     - Automatic reconnection logic
     - Windows-specific error handling
-    - Connection state tracking
+    - Connection state taken straight from the underlying BleakClient
     - Proper cleanup on errors
     
     Usage:
@@ -167,18 +316,29 @@ class BLEConnectionManager:
             # ... use client ...
     """
     
-    def __init__(self, address: str, reconnect_attempts: int = 3):
+    def __init__(
+        self,
+        address: str,
+        reconnect_attempts: int = 3,
+        low_latency: bool = False,
+        timeout: float = 10.0
+    ):
         """
         Initialize connection manager.
         
         Args:
             address: BLE device address
             reconnect_attempts: Number of reconnection attempts on failure
+            low_latency: Request a short connection interval after connecting
+            timeout: Per-attempt connect timeout in seconds (on BlueZ this
+                also bounds the scan for an address BlueZ has not seen yet)
         """
         self.address = address
         self.reconnect_attempts = reconnect_attempts
+        self.low_latency = low_latency
+        self.timeout = timeout
         self.client: Optional[BleakClient] = None
-        self._connected = False
+        self._conn_params_request = None
     
     async def __aenter__(self):
         """Connect to device."""
@@ -195,7 +355,7 @@ class BLEConnectionManager:
         Connect to BLE device with retry logic.
         
         Raises:
-            RuntimeError: If connection fails after all retries
+            BLEConnectionError: If connection fails after all retries
         """
         for attempt in range(self.reconnect_attempts):
             try:
@@ -204,38 +364,32 @@ class BLEConnectionManager:
                     f"(attempt {attempt + 1}/{self.reconnect_attempts})..."
                 )
                 
-                self.client = BleakClient(self.address)
+                # BleakClient.connect() raises on failure and cleans up after
+                # itself, so no separate is_connected check is needed
+                self.client = BleakClient(self.address, timeout=self.timeout)
                 await self.client.connect()
-                
-                if not self.client.is_connected:
-                    raise RuntimeError("Connection failed (client not connected)")
-                
-                self._connected = True
                 logger.info(f"[BLE] Successfully connected to {self.address}")
+                
+                if self.low_latency:
+                    self._conn_params_request = request_low_latency_connection(self.client)
                 return
                 
             except Exception as e:
                 logger.error(f"[BLE] Connection attempt {attempt + 1} failed: {e}")
-                
-                if self.client:
-                    try:
-                        await self.client.disconnect()
-                    except:
-                        pass
-                    self.client = None
+                self.client = None
                 
                 if attempt < self.reconnect_attempts - 1:
-                    wait_time = 2 ** attempt
-                    logger.info(f"[BLE] Retrying in {wait_time}s...")
+                    wait_time = _backoff_delay(attempt)
+                    logger.info(f"[BLE] Retrying in {wait_time:.1f}s...")
                     await asyncio.sleep(wait_time)
         
-        raise RuntimeError(
+        raise BLEConnectionError(
             f"Failed to connect to {self.address} after {self.reconnect_attempts} attempts"
         )
     
     async def disconnect(self):
         """Disconnect from device with cleanup."""
-        if self.client and self._connected:
+        if self.client is not None:
             try:
                 logger.info(f"[BLE] Disconnecting from {self.address}...")
                 await self.client.disconnect()
@@ -243,10 +397,10 @@ class BLEConnectionManager:
             except Exception as e:
                 logger.error(f"[BLE] Error during disconnect: {e}")
             finally:
-                self._connected = False
+                self._conn_params_request = None
                 self.client = None
     
     @property
     def is_connected(self) -> bool:
         """Check if currently connected."""
-        return self._connected and self.client and self.client.is_connected
+        return self.client is not None and self.client.is_connected
@@ -7,23 +7,29 @@ Usage:
 
 import argparse
 import asyncio
-import datetime as dt
 import logging
 import pathlib
+import signal
 import struct
 import sys
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from bleak import BleakClient, BleakScanner
 
 # Import Windows-compatible BLE utilities
 from ble_utils import (
     setup_windows_event_loop,
+    setup_fast_event_loop,
     init_windows_com_threading,
     discover_device_with_retry,
-    BLEConnectionManager
+    BLEConnectionManager,
+    BLEConnectionError
 )
 
 # Configure logging
@@ -38,6 +44,33 @@ CTRL_UUID = "0000ff02-0000-1000-8000-00805f9b34fb"
 
 PACKET_STRUCT = struct.Struct("<IHH6fB3x")
 
+# Last discovered device address; lets later runs skip the BLE scan
+ADDRESS_CACHE = pathlib.Path(__file__).parent / "servesense_address.txt"
+ADDRESS_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+# Connect timeout for the single attempt on a cached address; a stale
+# address should fall back to a scan quickly (bleak's default is 10 s)
+CACHED_CONNECT_TIMEOUT = 4.0  # seconds
+
+# Same layout as PACKET_STRUCT, for decoding several packets at once
+PACKET_DTYPE = np.dtype([
+    ("timestamp_ms", "<u4"),
+    ("session", "<u2"),
+    ("sequence", "<u2"),
+    ("ax", "<f4"), ("ay", "<f4"), ("az", "<f4"),
+    ("gx", "<f4"), ("gy", "<f4"), ("gz", "<f4"),
+    ("flags", "u1"),
+    ("reserved", "V3"),
+])
+assert PACKET_DTYPE.itemsize == PACKET_STRUCT.size
+
+# Pre-bound for the notify callback: avoids an attribute lookup per packet
+_unpack_packet = PACKET_STRUCT.unpack_from
+PACKET_SIZE = PACKET_STRUCT.size
+
+
+class CaptureSetupError(RuntimeError):
+    """Raised when a connected device cannot be set up for streaming."""
+
 
 @dataclass
 class ServeSample:
@@ -55,8 +88,9 @@ class ServeSample:
     label: Optional[str] = None
 
     @classmethod
-    def from_bytes(cls, payload: bytes, label: Optional[str]) -> "ServeSample":
-        millis, session, seq, ax, ay, az, gx, gy, gz, flags = PACKET_STRUCT.unpack(payload)
+    def from_bytes(cls, payload, label: Optional[str]) -> "ServeSample":
+        """Decode one packet from any bytes-like object (bytes, bytearray, memoryview)."""
+        millis, session, seq, ax, ay, az, gx, gy, gz, flags = PACKET_STRUCT.unpack_from(payload)
         return cls(
             timestamp_ms=millis,
             session=session,
@@ -69,63 +103,230 @@ class ServeSample:
         )
 
 
+class SampleBuffer:
+    """
+    Growable struct-of-arrays store for decoded IMU packets.
+    
+    The notify callback writes each packet straight into preallocated
+    NumPy arrays instead of allocating a ServeSample per packet. Each
+    field, including each IMU channel, has its own contiguous array so
+    save_samples() can hand the columns to Arrow without copying.
+    """
+
+    FIELDS = ("timestamp_ms", "session", "sequence",
+              "ax", "ay", "az", "gx", "gy", "gz", "flags")
+
+    def __init__(self, label: Optional[str] = None, capacity: int = 4096):
+        self.label = label
+        self.size = 0
+        for name in self.FIELDS:
+            setattr(self, name, np.empty(capacity, dtype=PACKET_DTYPE[name]))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self, needed: int = 1):
+        """Double capacity until `needed` more samples fit, keeping the samples written so far."""
+        capacity = max(1, 2 * len(self.flags))
+        while capacity < self.size + needed:
+            capacity *= 2
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def append(self, payload) -> None:
+        """Decode one packet from any bytes-like object, without copying it."""
+        millis, session, seq, ax, ay, az, gx, gy, gz, flags = _unpack_packet(payload)
+        i = self.size
+        if i == len(self.flags):
+            self._grow()
+        self.timestamp_ms[i] = millis
+        self.session[i] = session
+        self.sequence[i] = seq
+        self.ax[i] = ax
+        self.ay[i] = ay
+        self.az[i] = az
+        self.gx[i] = gx
+        self.gy[i] = gy
+        self.gz[i] = gz
+        self.flags[i] = flags
+        self.size = i + 1
+
+    def extend(self, payload) -> None:
+        """Decode a batch of back-to-back packets as one contiguous slab write."""
+        packets = np.frombuffer(payload, dtype=PACKET_DTYPE)
+        i, n = self.size, len(packets)
+        if i + n > len(self.flags):
+            self._grow(n)
+        for name in self.FIELDS:
+            getattr(self, name)[i:i + n] = packets[name]
+        self.size = i + n
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Return the captured samples as ServeSample-ordered columns."""
+        n = self.size
+        flags = self.flags[:n]
+        columns = {name: getattr(self, name)[:n] for name in self.FIELDS[:-1]}
+        columns["capture_on"] = flags & 0x01
+        columns["marker_edge"] = (flags >> 1) & 0x01
+        return columns
+
+
 async def find_device(name_hint: str) -> str:
     """
     Find BLE device with retry logic (Windows-compatible).
     
-    Uses discover_device_with_retry for robust device discovery
-    with exponential backoff.
+    Uses discover_device_with_retry, which returns as soon as the
+    device advertises instead of waiting out a fixed scan window.
     """
     return await discover_device_with_retry(name_hint, timeout=5.0, max_retries=3)
 
 
-async def collect(address: str, duration: Optional[float], label: Optional[str]) -> List[ServeSample]:
+def load_cached_address(name_hint: str) -> Optional[str]:
+    """
+    Return the cached device address if it is fresh and was found under
+    the same name hint.
+    
+    The cache file holds the address on its first line and the name hint
+    it was discovered with on its second.
+    """
+    try:
+        if time.time() - ADDRESS_CACHE.stat().st_mtime > ADDRESS_CACHE_MAX_AGE:
+            return None
+        lines = ADDRESS_CACHE.read_text().splitlines()
+    except OSError:
+        return None
+    if len(lines) < 2 or lines[1] != name_hint:
+        return None
+    return lines[0].strip() or None
+
+
+def save_cached_address(address: str, name_hint: str):
+    try:
+        ADDRESS_CACHE.write_text(f"{address}\n{name_hint}\n")
+    except OSError as e:
+        logger.warning(f"Could not cache device address: {e}")
+
+
+def clear_cached_address():
+    try:
+        ADDRESS_CACHE.unlink()
+    except OSError:
+        pass
+
+
+async def collect(
+    address: str,
+    duration: Optional[float],
+    label: Optional[str],
+    low_latency: bool = False,
+    reconnect_attempts: int = 3,
+    connect_timeout: float = 10.0
+) -> SampleBuffer:
     """
     Collect IMU samples from BLE device (Windows-compatible).
     
     Uses BLEConnectionManager for robust connection handling with
     automatic retry and proper cleanup.
     """
-    samples: List[ServeSample] = []
+    samples = SampleBuffer(label)
 
-    def handle(_, data: bytearray):
-        if len(data) != PACKET_STRUCT.size:
-            logger.warning(f"Unexpected payload size {len(data)}")
-            return
-        samples.append(ServeSample.from_bytes(bytes(data), label))
+    # Default arguments bind the buffer methods as fast locals
+    def handle(_, data: bytearray, _append=samples.append, _extend=samples.extend):
+        # Accept notifications carrying several back-to-back packets
+        size = len(data)
+        if size == PACKET_SIZE:
+            _append(data)
+        elif size and size % PACKET_SIZE == 0:
+            _extend(data)
+        else:
+            logger.warning(f"Unexpected payload size {size}")
 
-    async with BLEConnectionManager(address) as client:
+    async with BLEConnectionManager(
+        address, reconnect_attempts=reconnect_attempts, low_latency=low_latency,
+        timeout=connect_timeout,
+    ) as client:
         logger.info(f"[BLE] Connected to {address}")
 
-        await client.start_notify(IMU_UUID, handle)
-        await client.write_gatt_char(CTRL_UUID, bytes([0x01]), response=True)  # start
+        try:
+            await client.start_notify(IMU_UUID, handle)
+            # Start needs no ACK round trip when the firmware allows it: the
+            # incoming stream confirms it. Older firmware only accepts acked writes.
+            ctrl = client.services.get_characteristic(CTRL_UUID)
+            ack_start = ctrl is None or "write-without-response" not in ctrl.properties
+            await client.write_gatt_char(CTRL_UUID, bytes([0x01]), response=ack_start)  # start
+        except Exception as e:
+            raise CaptureSetupError(f"Could not start capture on {address}: {e}") from e
         logger.info("[BLE] Capture started")
 
-        start = dt.datetime.now()
-        try:
-            while True:
-                await asyncio.sleep(0.1)
-                if duration and (dt.datetime.now() - start).total_seconds() > duration:
-                    break
-        except KeyboardInterrupt:
+        # Wake only when the duration expires or Ctrl-C arrives, instead of
+        # polling the clock
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+
+        def on_sigint():
             logger.info("\n[BLE] KeyboardInterrupt – stopping stream")
+            stop.set()
+
+        timer = loop.call_later(duration, stop.set) if duration else None
+        sigint_handler = False
+        previous_sigint = None
+        try:
+            loop.add_signal_handler(signal.SIGINT, on_sigint)
+            sigint_handler = True
+        except (NotImplementedError, RuntimeError):
+            # Windows event loops have no add_signal_handler. Without a handler
+            # of our own, asyncio.run() turns Ctrl-C into a cancellation of
+            # this task and the capture is lost, so hand the signal to the loop
+            try:
+                previous_sigint = signal.signal(
+                    signal.SIGINT, lambda *_: loop.call_soon_threadsafe(on_sigint)
+                )
+            except ValueError:
+                # Not on the main thread; only the duration timer can stop us
+                pass
+
+        try:
+            await stop.wait()
         finally:
+            if timer is not None:
+                timer.cancel()
+            if sigint_handler:
+                loop.remove_signal_handler(signal.SIGINT)
+            elif previous_sigint is not None:
+                signal.signal(signal.SIGINT, previous_sigint)
             await client.write_gatt_char(CTRL_UUID, bytes([0x00]), response=True)
             await client.stop_notify(IMU_UUID)
 
     return samples
 
 
-def save_samples(samples: List[ServeSample], out_path: pathlib.Path):
+def save_samples(samples: SampleBuffer, out_path: pathlib.Path):
     if not samples:
         logger.warning("No samples captured; nothing to save")
         return
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    df = pd.DataFrame([asdict(s) for s in samples])
+    # Columns keep the buffer's compact dtypes (uint32/uint16/float32/uint8)
+    columns = samples.columns()
     if out_path.suffix.lower() == ".csv":
+        df = pd.DataFrame(columns)
+        df["label"] = samples.label
         df.to_csv(out_path, index=False)
     else:
-        df.to_parquet(out_path, index=False)
+        # Build the Arrow table straight from the NumPy columns (zero-copy for
+        # the contiguous numeric arrays) instead of going through pandas
+        table = pa.table({name: pa.array(col) for name, col in columns.items()})
+        if samples.label is not None:
+            # One label per capture; dictionary-encode it instead of repeating it
+            label = pa.DictionaryArray.from_arrays(
+                pa.array(np.zeros(len(samples), dtype=np.int8)), pa.array([samples.label])
+            )
+        else:
+            label = pa.nulls(len(samples), pa.string())
+        table = table.append_column("label", label)
+        pq.write_table(table, out_path, compression="zstd", compression_level=3)
     logger.info(f"Saved {len(samples)} samples to {out_path}")
 
 
@@ -133,24 +334,68 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Serve Sense BLE data collector")
     parser.add_argument("--address", help="BLE MAC address (skip auto-discovery)")
     parser.add_argument("--name", default="ServeSense", help="Device name hint for discovery")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore the cached device address and scan")
     parser.add_argument("--out", required=True, type=pathlib.Path, help="Output file (.parquet or .csv)")
     parser.add_argument("--label", default=None, help="Optional label for the captured serves")
     parser.add_argument("--duration", type=float, default=None, help="Auto-stop after N seconds")
+    parser.add_argument("--low-latency", action="store_true",
+                        help="Request a short BLE connection interval (Windows 11+ only)")
     return parser.parse_args()
 
 
+async def run(args: argparse.Namespace) -> SampleBuffer:
+    """
+    Resolve the device address and collect, all on one event loop.
+    
+    Keeping discovery and capture in a single asyncio.run() avoids setting
+    up and tearing down the event loop (and the WinRT runtime on Windows)
+    twice per session.
+    """
+    address = args.address
+    cached = False
+    if not address and not args.no_cache:
+        address = load_cached_address(args.name)
+        cached = address is not None
+        if cached:
+            logger.info(f"[BLE] Using cached address {address} ({ADDRESS_CACHE.name})")
+    if not address:
+        address = await find_device(args.name)
+        save_cached_address(address, args.name)
+
+    try:
+        # A cached address gets one quick attempt before falling back to a scan
+        return await collect(
+            address, args.duration, args.label, args.low_latency,
+            reconnect_attempts=1 if cached else 3,
+            connect_timeout=CACHED_CONNECT_TIMEOUT if cached else 10.0,
+        )
+    except (BLEConnectionError, CaptureSetupError) as e:
+        # A cached address that is unreachable or is not a working logger
+        # (e.g. another device took over the address) is dropped
+        if not cached:
+            raise
+        logger.warning(f"[BLE] Cached address failed ({e}); rescanning")
+        clear_cached_address()
+        address = await find_device(args.name)
+        save_cached_address(address, args.name)
+        return await collect(address, args.duration, args.label, args.low_latency)
+
+
 def main():
     """Main entry point with Windows BLE support."""
     # Initialize Windows-compatible event loop
     setup_windows_event_loop()
     
+    # Use uvloop on Linux/macOS when available (no-op on Windows)
+    setup_fast_event_loop()
+    
     # Initialize COM threading on Windows (safe on other platforms)
     init_windows_com_threading()
     
     args = parse_args()
     try:
-        address = args.address or asyncio.run(find_device(args.name))
-        samples = asyncio.run(collect(address, args.duration, args.label))
+        samples = asyncio.run(run(args))
         save_samples(samples, args.out)
     except Exception as exc:
         logger.error(f"{exc}", exc_info=True)